@@ -4,30 +4,40 @@ This Class is defined to give an overall score of the QAOA performance on a quan
 
 from typing import Callable, List, Any, Sequence
 
-import random
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-from multiprocessing import cpu_count, Pool
+import hashlib
+import tempfile
+from multiprocessing import cpu_count, get_context
 from scipy.optimize import curve_fit
-from scipy import interpolate
 from scipy.optimize import minimize, OptimizeResult
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel
+from qiskit_aer.primitives import Sampler as AerSampler
+from qiskit import transpile
 from qiskit.circuit import QuantumCircuit
 from qiskit.primitives import BackendSampler
 from qiskit.circuit.library import QAOAAnsatz
 from qiskit_algorithms.minimum_eigensolvers import QAOA, MinimumEigensolverResult
 from qiskit_algorithms.optimizers import COBYLA
-from qiskit_algorithms import MinimumEigensolverResult
-from qiskit_ibm_runtime import Options, Session, Estimator
+from qiskit_algorithms import MinimumEigensolverResult, AlgorithmError
+from qiskit_algorithms.utils import algorithm_globals
+from qiskit_ibm_runtime import Session, Estimator
 from qiskit.quantum_info import Statevector, SparsePauliOp
 from qiskit_ibm_runtime import Estimator
-from functools import partial
-
-from .utility import Q_to_paulis, all_quantum_states
+from functools import partial, lru_cache
+
+from .utility import (
+    cached_Q_to_paulis,
+    cached_operator_energies,
+    qubo_ground_state,
+    qubo_ground_state_numba,
+    qubo_ground_state_gpu,
+    NUMBA_AVAILABLE,
+)
 from .instances import *
 
 Matrix = Any
@@ -37,10 +47,184 @@ Fake_Backend = Any
 Quantum_Processor = Any
 
 
+class _FixedAnsatzQAOA(QAOA):
+    """QAOA which keeps its ansatz while the operator stays the same.
+    `QAOA` rebuilds the ansatz with new parameters on every run, so the sampler
+    transpiles it again for each repetition. Reusing it means one transpilation in total.
+    """
+
+    _ansatz_operator = None
+
+    def _check_operator_ansatz(self, operator: SparsePauliOp) -> None:
+        if operator is not self._ansatz_operator:
+            super()._check_operator_ansatz(operator)
+            self._ansatz_operator = operator
+
+
+def _shot_ramp_optimizer(
+    optimizer: COBYLA,
+    sampler: BackendSampler,
+    max_shots: int,
+    min_shots: int = 1024,
+    ramp_every: int = 10,
+) -> Callable:
+    """Wrap `optimizer` so that the shots of `sampler` ramp up while it runs.
+    The shots start at `min_shots` and grow by `min_shots` every `ramp_every` evaluations,
+    up to `max_shots`. The final state is sampled with `max_shots`.
+    """
+
+    def minimize_with_ramp(fun, x0, jac=None, bounds=None):
+        n_evals = 0
+
+        def ramped_fun(x):
+            nonlocal n_evals
+            shots = min(max_shots, min_shots * (1 + n_evals // ramp_every))
+            sampler.set_options(shots=shots)
+            n_evals += 1
+            return fun(x)
+
+        result = optimizer.minimize(ramped_fun, x0, jac=jac, bounds=bounds)
+        sampler.set_options(shots=max_shots)
+        return result
+
+    return minimize_with_ramp
+
+
+class _PrecomputedEnergyQAOA(_FixedAnsatzQAOA):
+    """QAOA whose cost is evaluated from precomputed bitstring energies.
+    The cost operator of a QUBO is diagonal, so its expectation is simply the sum of
+    p(s) * E(s) over the sampled bitstrings s. This replaces the evaluation of every
+    Pauli term on every bitstring in each COBYLA iteration.
+    The best measurement of the results is not tracked, and neither a callback
+    nor an aggregation is supported.
+    """
+
+    def __init__(self, energies: np.ndarray, **kwargs) -> None:
+        """
+        args:
+            energies: the eigenvalue of the operator for each bitstring, indexed by its decimal form
+        """
+        super().__init__(**kwargs)
+        self._energies = energies
+
+    def _get_evaluate_energy(
+        self,
+        operator: SparsePauliOp,
+        ansatz: QuantumCircuit,
+        return_best_measurement: bool = False,
+    ):
+        if self.callback is not None or self.aggregation is not None:
+            raise ValueError(
+                "Precomputed energies support neither a callback nor an aggregation."
+            )
+        num_parameters = ansatz.num_parameters
+        if num_parameters == 0:
+            raise AlgorithmError(
+                "The ansatz must be parameterized, but has 0 free parameters."
+            )
+
+        def evaluate_energy(parameters: np.ndarray) -> np.ndarray | float:
+            parameters = np.reshape(parameters, (-1, num_parameters)).tolist()
+            quasi_dists = (
+                self.sampler.run(len(parameters) * [ansatz], parameters)
+                .result()
+                .quasi_dists
+            )
+            values = np.empty(len(quasi_dists))
+            for k, dist in enumerate(quasi_dists):
+                states = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+                probs = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+                values[k] = probs @ self._energies[states]
+            return values if len(values) > 1 else values[0]
+
+        if return_best_measurement:
+            return evaluate_energy, {"best": None}
+        return evaluate_energy
+
+
+# QAOA solver and operator of the current worker process, see `_init_qaoa_worker`
+_worker_qaoa = None
+_worker_op = None
+
+
+def _init_qaoa_worker(
+    backend: Fake_Backend | None,
+    options: dict,
+    maxiter: int,
+    n_layers: int,
+    op: SparsePauliOp,
+    energies: np.ndarray,
+    initial_point: Sequence[float] | None = None,
+    max_shots: int | None = None,
+) -> None:
+    """Build the sampler, optimizer and QAOA solver once per worker process.
+    `energies` are the eigenvalues of `op` for every bitstring, see `_PrecomputedEnergyQAOA`.
+    Without a backend, the exact probabilities from Aer's statevector method are sampled.
+    Without an initial point, every repetition starts from random parameters.
+    With `max_shots`, the shots ramp up to it during each optimization.
+    """
+    global _worker_qaoa, _worker_op
+    # draw the random initial points of this process from fresh entropy
+    algorithm_globals.random_seed = None
+    if backend is None:
+        sampler = AerSampler(
+            backend_options={"method": "statevector"},
+            run_options={"shots": None},
+        )
+    else:
+        sampler = BackendSampler(backend=backend, options=options)
+    optimizer = COBYLA(maxiter=maxiter)
+    if max_shots is not None:
+        optimizer = _shot_ramp_optimizer(optimizer, sampler, max_shots)
+    _worker_qaoa = _PrecomputedEnergyQAOA(
+        energies,
+        sampler=sampler,
+        optimizer=optimizer,
+        reps=n_layers,
+        initial_point=initial_point,
+    )
+    _worker_op = op
+
+
+def _run_qaoa_worker(_: int) -> MinimumEigensolverResult:
+    """Run one independent QAOA repetition with the solver of this process."""
+    return _worker_qaoa.compute_minimum_eigenvalue(_worker_op)
+
+
+def _accuracy_histogram(accuracy_list: np.ndarray, n_boxes: int) -> np.ndarray:
+    """Count the accuracy values in `n_boxes` uniform boxes on [0, 1].
+    The boxes are uniform, so the box index is found directly instead of searched,
+    and then corrected by one box where rounding put a value on the wrong side of an edge.
+    The counts match `np.histogram`, and an accuracy of exactly 1 falls into the last box.
+    Values just outside [0, 1] from rounding are counted in the first or last box.
+    """
+    accuracy_list = np.asarray(accuracy_list, dtype=np.float64)
+    edges = np.linspace(0, 1, n_boxes + 1)
+    box_index = np.clip((accuracy_list * n_boxes).astype(np.int64), 0, n_boxes - 1)
+    box_index[accuracy_list < edges[box_index]] -= 1
+    box_index[accuracy_list >= edges[box_index + 1]] += 1
+    box_index = np.clip(box_index, 0, n_boxes - 1)
+    return np.bincount(box_index, minlength=n_boxes)
+
+
+@lru_cache(maxsize=1)
+def _load_score_curves() -> pd.DataFrame:
+    """Read the built-in score curves once and keep them in memory."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    csv_file_path = os.path.join(dir_path, "score_curves.csv")
+    return pd.read_csv(csv_file_path)
+
+
 class Toniq:
-    def __init__(self) -> None:
+    def __init__(self, use_gpu: bool = False) -> None:
+        """
+        args:
+            use_gpu: search ground states on a GPU with CuPy, which must be installed.
+        """
+        self.use_gpu = use_gpu
         self.backend_list = []
         self.maxiter = 10000
+        self.cache_dir = os.path.join(os.path.expanduser("~"), ".hamiltoniq_cache")
         self.options = {
             'optimization_level': 0,
             'resilience_level': 0
@@ -60,21 +244,19 @@ class Toniq:
         return:
             mat: a symmetric matrix
         """
-        mat = np.array(
-            [random.uniform(lower, upper) for _ in range(n_qubits**2)]
-        )  # Create a flat array of random numbers with size n_qubits^2
-        mat = mat.reshape(n_qubits, n_qubits)
+        mat = np.random.default_rng().uniform(
+            lower, upper, size=(n_qubits, n_qubits)
+        )  # Draw all n_qubits^2 random numbers in a single call
         mat = np.triu(mat)
         mat += mat.T - np.diag(
             mat.diagonal()
         )  # Make the matrix symmetric by adding its transpose and subtracting the diagonal
 
         # print the hardness
-        normalized_covariance = [
-            mat[i, j] / np.sqrt(abs(mat[i, i] * mat[j, j]))
-            for i in range(len(mat))
-            for j in range(i + 1)
-        ]
+        scale = np.sqrt(np.abs(mat.diagonal()))
+        normalized_covariance = (mat / np.outer(scale, scale))[
+            np.tril_indices(n_qubits)
+        ]  # the lower triangle (diagonal included) of the normalized matrix
         print(f"the hardness is {np.var(normalized_covariance)}")
 
         return mat
@@ -90,16 +272,34 @@ class Toniq:
 
         Parameters:
             params: values of ansatz parameters
-            ansatz: the quantum circuit from which a state is generated
-            hamiltonian: the Hamiltonian to which the energy corresponds
-            estimator: estimator primitive instance
+            ansatz: the quantum circuit from which a state is generated, already transpiled
+                for the backend of the estimator
+            hamiltonian: the Hamiltonian to which the energy corresponds, laid out like the ansatz
+            estimator: estimator primitive instance (V2)
 
         Returns:
             float: estimated energy
         """
-        cost = estimator.run(ansatz, op, parameter_values=params).result().values[0]
-        return cost
+        result = estimator.run([(ansatz, op, params)]).result()
+        return float(result[0].data.evs)
     
+    @staticmethod
+    def tqa_initial_point(n_layers: int, delta_t: float = 0.75) -> np.ndarray:
+        """Return QAOA parameters following a Trotterized quantum annealing (TQA) schedule.
+        The mixer angles decrease linearly from `delta_t`, while the cost angles increase to it.
+
+        args:
+            n_layers: the number of layers
+            delta_t: the time step of the annealing schedule
+
+        return:
+            a numpy array of all betas followed by all gammas, the parameter order of `QAOAAnsatz`
+        """
+        fractions = np.arange(1, n_layers + 1) / n_layers
+        betas = delta_t * (1 - fractions)
+        gammas = delta_t * fractions
+        return np.concatenate([betas, gammas])
+
     def set_optimization_level(self, optimization_level:int):
         self.options['optimization_level'] = optimization_level
     
@@ -117,49 +317,75 @@ class Toniq:
             and the corresponding energy (float).
         """
         n_qubits = np.shape(Q)[0]
-        energy_list = []
-        for state in all_quantum_states(n_qubits):
-            energy_list.append(
-                np.dot(state, np.dot(Q, state))
-            )  # calculate all possible energy
-        dec_min = np.argmin(energy_list)  # ground state in decimal
+        if self.use_gpu:
+            dec_min, energy = qubo_ground_state_gpu(Q)
+        elif n_qubits > 21 and NUMBA_AVAILABLE:
+            # the Gray-code kernel costs O(n 2^n) instead of O(n^2 2^n), which outweighs
+            # its one-off JIT compilation of a few seconds from about 22 qubits on
+            dec_min, energy = qubo_ground_state_numba(Q)
+        else:
+            dec_min, energy = qubo_ground_state(Q)  # ground state in decimal
         ground = {
             "bin_state": f"{bin(dec_min)[2:]:0>{n_qubits}}",  # ground state in binary
             "dec_state": dec_min,
-            "energy": energy_list[dec_min],  # ground state energy
+            "energy": energy,  # ground state energy
         }
         return ground
 
     def get_results_simulator(
         self,
-        fake_backend: Fake_Backend,
+        fake_backend: Fake_Backend | None,
         n_layers: int,
         n_reps: int = 1000,
         n_cores: int | None = None,
+        initial_point: Sequence[float] | None = None,
+        max_shots: int | None = None,
     ) -> Sequence[MinimumEigensolverResult]:
         """Return certain number of QAOA results on a specified fake backend.
+        The operator is taken from `self.op`.
 
         args:
-            fake_backend: Qiskit fake backend, which is a noisy simulator
+            fake_backend: Qiskit fake backend, which is a noisy simulator.
+                If None, a noiseless statevector simulation without shot noise is used.
             n_layers: the number of layers
             n_reps: how many QAOA results will be returned
+            n_cores: the number of worker processes. Auto detection will be used if this number is not specify.
+                The workers are spawned, so scripts calling this need an `if __name__ == "__main__":` guard.
+            initial_point: the initial QAOA parameters, e.g. from `tqa_initial_point`.
+                Random parameters are drawn for every repetition if this is not specified.
+            max_shots: if specified, early COBYLA iterations use fewer shots, ramping from 1024
+                up to this number, which is also used for the final state.
+                The backend default shots are used throughout if this is not specified.
+                It requires a `fake_backend`, since the noiseless simulation samples no shots.
 
         return:
             a list of MinimumEigensolverResult
         """
+        if max_shots is not None and fake_backend is None:
+            raise ValueError(
+                "max_shots requires a backend, exact simulations use no shots."
+            )
         if n_cores is None:
             n_cores = cpu_count()  # detect the total number of cores
-        sampler = BackendSampler(backend=fake_backend, options=self.options)
-        optimizer = COBYLA(maxiter=self.maxiter)
-        qaoa = QAOA(
-            sampler=sampler,
-            optimizer=optimizer,
-            reps=n_layers,
+        # the operator of a QUBO is diagonal, its eigenvalues are the bitstring energies
+        energies = cached_operator_energies(self.op)
+        worker_args = (
+            fake_backend,
+            self.options,
+            self.maxiter,
+            n_layers,
+            self.op,
+            energies,
+            initial_point,
+            max_shots,
         )
-        with Pool(n_cores) as p:
-            results = p.map(
-                qaoa.compute_minimum_eigenvalue, [self.op for _ in range(n_reps)]
-            )
+        # Each worker builds its own QAOA once, only the indices are sent per task.
+        # Workers are spawned rather than forked, even for a single core, because Aer's
+        # OpenMP runtime does not survive a fork and forked workers share one random state.
+        with get_context("spawn").Pool(
+            n_cores, initializer=_init_qaoa_worker, initargs=worker_args
+        ) as p:
+            results = p.map(_run_qaoa_worker, range(n_reps))
         return results
 
     def get_results_processor(
@@ -167,6 +393,7 @@ class Toniq:
         backend: Quantum_Processor,
         n_layers: int,
         n_reps: int = 1000,
+        initial_point: Sequence[float] | None = None,
     ) -> Sequence[OptimizeResult]:
         """Return certain number of QAOA results on a specified quantum processor.
 
@@ -174,30 +401,54 @@ class Toniq:
             backend: Qiskit fake backend, which is a noisy simulator
             n_layers: the number of layers
             n_reps: how many QAOA results will be returned
+            initial_point: the initial QAOA parameters, e.g. from `tqa_initial_point`.
+                A random point is used if this is not specified.
 
         return:
             a list of MinimumEigensolverResult
         """
         ansatz = QAOAAnsatz(self.op, reps=n_layers)
+        # Transpile once, so that each COBYLA step only binds parameters. Level 3 is what
+        # the runtime used to apply to each job; the estimator needs circuits for its backend.
+        isa_ansatz = transpile(ansatz, backend=backend, optimization_level=3)
+        isa_op = self.op.apply_layout(isa_ansatz.layout)
         session = Session(backend=backend)
-        estimator = Estimator(session=session)
-        x0 = (
-            np.pi * np.random.rand(ansatz.num_parameters) - np.pi / 2
-        )  # the same bounds as `SamplingVQE` class
+        estimator = Estimator(mode=session)
+        if initial_point is not None:
+            x0 = np.asarray(initial_point)
+        else:
+            x0 = (
+                np.pi * np.random.rand(ansatz.num_parameters) - np.pi / 2
+            )  # the same bounds as `SamplingVQE` class
         results = [
             minimize(
-                self.QAOA_cost, x0, args=(ansatz, self.op, estimator), method="COBYLA"
+                self.QAOA_cost,
+                x0,
+                args=(isa_ansatz, isa_op, estimator),
+                method="COBYLA",
             )
             for _ in range(n_reps)
         ]
         return results
 
+    def _reference_cache_path(self, Q: Matrix, n_layers: int, n_points: int) -> str:
+        """Return the file in `cache_dir` where the reference of these settings is stored."""
+        Q = np.ascontiguousarray(Q, dtype=np.float64)
+        key = hashlib.sha1(
+            Q.tobytes()
+            + int(n_layers).to_bytes(4, "little")
+            + int(n_points).to_bytes(8, "little")
+            + int(self.maxiter).to_bytes(8, "little")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"reference_{key}.npy")
+
     def get_reference(
         self,
         Q: Matrix,
         n_layers: int,
         n_points: int = 10000,
-        n_cores=1,
+        n_cores: int | None = None,
+        use_cache: bool = True,
     ) -> Sequence[float]:
         """Calculate the score function.
         The score function is represented by uniform sampling.
@@ -207,6 +458,9 @@ class Toniq:
             n_layers:
             n_reps: number of repetation by which the QAOA run on a simulator
             n_points: number of points in sampling percedure
+            n_cores: the expected number of cores on PC. Auto detection will be used if this number is not specify.
+            use_cache: load the reference from `cache_dir` if it was calculated before with the same
+                Q, n_layers, n_points and maxiter, and save newly calculated ones there.
 
         return:
             score_curve_sampling: A list of uniform sampling of the score curve. It has 201 elements.
@@ -214,30 +468,40 @@ class Toniq:
         """
         # prepare Q-matrix and its operators
         self.Q = Q
-        self.op, _ = Q_to_paulis(self.Q)
+        self.op, _ = cached_Q_to_paulis(self.Q)
+
+        if use_cache:
+            cache_path = self._reference_cache_path(Q, n_layers, n_points)
+            if os.path.exists(cache_path):
+                return np.load(cache_path)
 
         ground_state_info = self.get_ground_state(Q)
         dec_ground_state = ground_state_info["dec_state"]
-        backend = AerSimulator()
 
-        # get the distribution of accuracy
+        # get the distribution of accuracy from exact, noiseless probabilities
         results = self.get_results_simulator(
-            backend, n_layers, n_reps=n_points, n_cores=n_cores
+            None, n_layers, n_reps=n_points, n_cores=n_cores
         )
-        accuracy_list = []
-        for i in results:
-            try:
-                accuracy_list.append(i.eigenstate[dec_ground_state])
-            except:
-                accuracy_list.append(0)
+        accuracy_list = np.array(
+            [res.eigenstate.get(dec_ground_state, 0) for res in results]
+        )  # the ground state is absent from a distribution if it is never measured
         n_boxes = 200
-        hist_x = np.linspace(0, 1, n_boxes + 1)
-        hist_y, _ = np.histogram(accuracy_list, bins=hist_x)
-        hist_y = np.divide(hist_y, np.shape(accuracy_list)[0])
+        hist_y = _accuracy_histogram(accuracy_list, n_boxes).astype(np.float32)
+        hist_y = np.divide(hist_y, np.float32(np.shape(accuracy_list)[0]))
 
-        # build the score function
-        cumulative_score = np.cumsum(hist_y)
-        score_curve_sampling = np.append(np.zeros(1), cumulative_score)
+        # build the score function, float32 rounding is far below the sampling error
+        cumulative_score = np.cumsum(hist_y, dtype=np.float32)
+        score_curve_sampling = np.append(
+            np.zeros(1, dtype=np.float32), cumulative_score
+        )
+        if use_cache:
+            # write to a temporary file first, so an interrupted run leaves no broken cache
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix=".npy", delete=False
+            ) as f:
+                np.save(f, score_curve_sampling)
+            os.replace(f.name, cache_path)
         return score_curve_sampling
 
     def score(self, accuracy_data: list, n_qubits: int, n_layers: int) -> float:
@@ -249,21 +513,17 @@ class Toniq:
             n_layers: the number of layers (used to find the score curves)
 
         return:
-            score: the score of a backend
+            score: the score of a backend. Accuracy outside [0, 1] is clamped to the ends of
+            the score curve, and no accuracy data gives a score of 0.
         """
-        dir_path = os.path.dirname(os.path.realpath(__file__))
-        csv_file_path = os.path.join(dir_path, 'score_curves.csv')
-        df = pd.read_csv(csv_file_path)   # import the score curve
-        score_y = df[f"qubits_{n_qubits}_layer_{n_layers}"]
-        score_x = df["score_x"]
-        f = interpolate.interp1d(
-            score_x, score_y, kind="linear"
-        )  # build the score function
-        score = 0.0
-        n_data = np.shape(accuracy_data)[0]
-        for i in accuracy_data:
-            score += f(i) * 2 / n_data
-        return score
+        if np.size(accuracy_data) == 0:
+            return 0.0
+        df = _load_score_curves()  # import the score curve
+        score_y = df[f"qubits_{n_qubits}_layer_{n_layers}"].to_numpy()
+        score_x = df["score_x"].to_numpy()
+        # evaluate the linear score function on all accuracy data at once
+        score = 2 * np.mean(np.interp(accuracy_data, score_x, score_y))
+        return float(score)
 
     def get_accuracy_simulator(
         self, data: Sequence[MinimumEigensolverResult], n_qubits: int
@@ -279,12 +539,9 @@ class Toniq:
         """
         ground_state_info = globals()[f"ground_{n_qubits}"]
         dec_ground_state = ground_state_info["dec_state"]
-        accuracy_list = []
-        for res in data:
-            try:
-                accuracy_list.append(res.eigenstate[dec_ground_state])
-            except:
-                accuracy_list.append(0)
+        accuracy_list = np.array(
+            [res.eigenstate.get(dec_ground_state, 0) for res in data]
+        )  # the ground state is absent from a distribution if it is never measured
         return accuracy_list
 
     def get_accuracy_processor(
@@ -306,11 +563,11 @@ class Toniq:
         ansatz = QAOAAnsatz(self.op, reps=n_layers)
         ground_state_info = globals()[f"ground_{n_qubits}"]
         dec_ground_state = ground_state_info["dec_state"]
-        accuracy_list = []
-        for res in data:
-            qc = ansatz.bind_parameters(res.x)
+        accuracy_list = np.empty(len(data))
+        for idx, res in enumerate(data):
+            qc = ansatz.assign_parameters(res.x)
             sv = Statevector(qc)
-            accuracy_list.append(abs(sv[dec_ground_state]) ** 2)
+            accuracy_list[idx] = abs(sv[dec_ground_state]) ** 2
         return accuracy_list
 
     def simulator_run(
@@ -341,7 +598,7 @@ class Toniq:
         self.Q = globals()[f"qubits_{n_qubits}"]
         if Q is not None:
             self.Q = Q
-        self.op, _ = Q_to_paulis(self.Q)
+        self.op, _ = cached_Q_to_paulis(self.Q)
 
         # run QAOA and get results
         results_list = self.get_results_simulator(
@@ -386,7 +643,7 @@ class Toniq:
         self.Q = globals()[f"qubits_{n_qubits}"]
         if Q is not None:
             self.Q = Q
-        self.op, _ = Q_to_paulis(self.Q)
+        self.op, _ = cached_Q_to_paulis(self.Q)
 
         # run QAOA and get the resutls
         results_list = self.get_results_processor(
@@ -396,9 +653,7 @@ class Toniq:
         )
 
         # analyse the results and get a score
-        accuracy_list = self.get_accuracy_processor(
-            results_list, n_qubits, n_layers, globals()[f"qubits_{n_qubits}"]
-        )
+        accuracy_list = self.get_accuracy_processor(results_list, n_qubits, n_layers)
 
         # plot the accuracy list
         if plot_results is True:
@@ -3,10 +3,18 @@ Supporting functions and some useful tools
 """
 
 from typing import List, Any, Callable, Dict, Tuple
+from functools import lru_cache
 
 import numpy as np
 from qiskit.quantum_info import Statevector, SparsePauliOp
 
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:  # numba is optional, the NumPy kernels are used instead
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
 matrix = Any
 circuit = Any
 counts = Dict
@@ -38,16 +46,172 @@ def Q_to_paulis(Q):
     return SparsePauliOp(pauli_terms, coeffs=coeffs), offset
 
 
-def all_quantum_states(n_qubits):
-    states = []
-    for i in range(2**n_qubits):
-        a = f"{bin(i)[2:]:0>{n_qubits}}"
-        vector = [0 for i in range(n_qubits)]
-        for i, j in enumerate(a):
-            if j == "1":
-                vector[i] = 1
-        states.append(vector)
-    return states
+@lru_cache(maxsize=8)
+def _cached_paulis(Q_bytes: bytes, n_qubits: int):
+    Q = np.frombuffer(Q_bytes, dtype=np.float64).reshape(n_qubits, n_qubits)
+    return Q_to_paulis(Q)
+
+
+def cached_Q_to_paulis(Q):
+    """Same as `Q_to_paulis`, but memoized on the content of Q,
+    so repeated runs on the same Q matrix reuse one Pauli decomposition.
+    """
+    Q = np.ascontiguousarray(Q, dtype=np.float64)
+    return _cached_paulis(Q.tobytes(), np.shape(Q)[0])
+
+
+@lru_cache(maxsize=8)
+def _cached_energies(z_bytes: bytes, coeff_bytes: bytes, n_qubits: int) -> np.ndarray:
+    z = np.frombuffer(z_bytes, dtype=bool).reshape(-1, n_qubits)
+    coeffs = np.frombuffer(coeff_bytes, dtype=np.float64)
+    # column k is qubit k, the least significant bit of the decimal form is qubit 0
+    bits = all_quantum_states(n_qubits)[:, ::-1]
+    energies = np.zeros(2**n_qubits)
+    for term_z, coeff in zip(z, coeffs):
+        parity = bits[:, term_z].sum(axis=1) & 1
+        energies += coeff * (1 - 2 * parity)
+    energies.flags.writeable = False  # shared between callers
+    return energies
+
+
+def cached_operator_energies(op: SparsePauliOp) -> np.ndarray:
+    """Return the eigenvalue of a diagonal operator, e.g. from `Q_to_paulis`,
+    for every bitstring, indexed by its decimal form.
+    It is memoized on the Pauli terms, so repeated runs on one operator share the vector.
+    """
+    if op.paulis.x.any():
+        raise ValueError("The operator is not diagonal, it has X or Y terms.")
+    z = np.ascontiguousarray(op.paulis.z)
+    coeffs = np.ascontiguousarray(np.real(op.coeffs), dtype=np.float64)
+    return _cached_energies(z.tobytes(), coeffs.tobytes(), op.num_qubits)
+
+
+def all_quantum_states(n_qubits) -> np.ndarray:
+    """Return all 2^n bitstrings as the rows of an int8 matrix, indexed by their decimal form.
+    The first column is the most significant bit.
+    """
+    return (
+        (np.arange(2**n_qubits)[:, None] >> np.arange(n_qubits)[::-1]) & 1
+    ).astype(np.int8)
+
+
+def qubo_energies(Q) -> np.ndarray:
+    """Return the energy x^T Q x of every bitstring x, indexed by its decimal form.
+    The first element of x is the most significant bit, as in `all_quantum_states`.
+    """
+    Q = np.asarray(Q, dtype=np.float64)
+    states = all_quantum_states(np.shape(Q)[0])
+    return np.einsum("ij,jk,ik->i", states, Q, states)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True)
+    def _ground_state_kernel(Q, n_chunks):
+        # Q is indexed by bit position (least significant first), and the states are
+        # visited in Gray-code order, so consecutive states differ by a single bit.
+        n_qubits = Q.shape[0]
+        n_states = 1 << n_qubits
+        chunk_size = (n_states + n_chunks - 1) // n_chunks
+        best_energy = np.full(n_chunks, np.inf)
+        best_state = np.zeros(n_chunks, dtype=np.int64)
+        for c in prange(n_chunks):
+            first = c * chunk_size
+            last = min(first + chunk_size, n_states)
+            if first >= last:
+                continue
+            # the first state of each chunk is evaluated from scratch
+            s = first ^ (first >> 1)
+            x = np.zeros(n_qubits, dtype=np.int8)
+            for b in range(n_qubits):
+                x[b] = (s >> b) & 1
+            row_sum = np.zeros(n_qubits)  # row_sum[a] = sum_b Q[a, b] x[b]
+            for a in range(n_qubits):
+                for b in range(n_qubits):
+                    if x[b]:
+                        row_sum[a] += Q[a, b]
+            energy = 0.0
+            for a in range(n_qubits):
+                if x[a]:
+                    energy += row_sum[a]
+            best_energy[c] = energy
+            best_state[c] = s
+            # every following state flips the lowest set bit of its Gray index
+            for g in range(first + 1, last):
+                b = 0
+                while not (g >> b) & 1:
+                    b += 1
+                if x[b]:
+                    energy -= 2 * row_sum[b] - Q[b, b]
+                    x[b] = 0
+                    for a in range(n_qubits):
+                        row_sum[a] -= Q[a, b]
+                else:
+                    energy += 2 * row_sum[b] + Q[b, b]
+                    x[b] = 1
+                    for a in range(n_qubits):
+                        row_sum[a] += Q[a, b]
+                if energy < best_energy[c]:
+                    best_energy[c] = energy
+                    best_state[c] = g ^ (g >> 1)
+        return best_state[np.argmin(best_energy)]
+
+
+def qubo_ground_state_numba(Q) -> Tuple[int, float]:
+    """Return the decimal ground state of Q and its energy without storing all energies.
+    Bitstrings are enumerated in Gray-code order, so each energy is updated from the
+    previous one in O(n) instead of recomputing x^T Q x in O(n^2).
+    Every thread scans its own block of bitstrings, so the memory cost is O(1) in 2^n.
+    Requires `numba`.
+    """
+    if not NUMBA_AVAILABLE:
+        raise ImportError("qubo_ground_state_numba requires numba to be installed.")
+    Q = np.asarray(Q, dtype=np.float64)
+    n_qubits = np.shape(Q)[0]
+    # the incremental update needs a symmetric matrix, which leaves x^T Q x unchanged,
+    # and the axes are reversed so that it is indexed by bit position
+    Q_bits = np.ascontiguousarray(((Q + Q.T) / 2)[::-1, ::-1])
+    dec_state = int(_ground_state_kernel(Q_bits, get_num_threads()))
+    # recompute the energy of the winner to drop the rounding of the incremental updates
+    state = (dec_state >> np.arange(n_qubits)[::-1]) & 1
+    return dec_state, float(state @ Q @ state)
+
+
+def _batched_ground_state(xp, Q, batch_size: int) -> Tuple[int, float]:
+    """Scan all bitstrings in batches of `batch_size` rows and keep a running minimum.
+    `xp` is the array module doing the work, either `numpy` or `cupy`.
+    """
+    Q = xp.asarray(Q, dtype=xp.float64)
+    n_qubits = Q.shape[0]
+    shifts = xp.arange(n_qubits)[::-1]
+    best_state, best_energy = 0, np.inf
+    for start in range(0, 2**n_qubits, batch_size):
+        stop = min(start + batch_size, 2**n_qubits)
+        states = ((xp.arange(start, stop)[:, None] >> shifts) & 1).astype(xp.float64)
+        energies = xp.einsum("ij,jk,ik->i", states, Q, states)
+        k = int(xp.argmin(energies))
+        energy = float(energies[k])
+        if energy < best_energy:
+            best_state, best_energy = start + k, energy
+    return best_state, best_energy
+
+
+def qubo_ground_state(Q, batch_size: int = 2**16) -> Tuple[int, float]:
+    """Return the decimal ground state of Q and its energy.
+    Only one batch of bitstrings and energies is held at a time, so the memory cost is
+    O(batch_size * n) instead of O(2^n * n).
+    """
+    return _batched_ground_state(np, Q, batch_size)
+
+
+def qubo_ground_state_gpu(Q, batch_size: int = 2**20) -> Tuple[int, float]:
+    """Return the decimal ground state of Q and its energy, searched on a GPU.
+    Bitstrings are evaluated in batches of `batch_size` rows to fit in GPU memory.
+    Requires `cupy`.
+    """
+    import cupy as cp  # only needed when the GPU is used
+
+    return _batched_ground_state(cp, Q, batch_size)
 
 
 def simple_coupling_map() -> list[Tuple[int, int]]:
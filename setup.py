@@ -23,6 +23,8 @@ setuptools.setup(
     ],
     extras_require={
         "qiskit": ["qiskit"],
+        "numba": ["numba"],
+        "gpu": ["cupy"],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
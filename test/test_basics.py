@@ -8,9 +8,22 @@ sys.path.insert(0, modulepath)
 
 import pytest
 import numpy as np
+from types import SimpleNamespace
+from qiskit.quantum_info import SparsePauliOp
+from qiskit.result import QuasiDistribution
 
-from else.benchmarking import Toniq
-from else.utility import all_quantum_states, Q_to_paulis
+from hamiltoniq.benchmark import Toniq, _accuracy_histogram
+from hamiltoniq.utility import (
+    all_quantum_states,
+    Q_to_paulis,
+    cached_Q_to_paulis,
+    cached_operator_energies,
+    qubo_energies,
+    qubo_ground_state,
+    qubo_ground_state_numba,
+    qubo_ground_state_gpu,
+)
+from hamiltoniq import instances
 
 tonic = Toniq()
 
@@ -36,6 +49,134 @@ def test_all_quantum_states(n_qubits):
     assert np.shape(states)[0] == 2**n_qubits
 
 
+@pytest.mark.parametrize("n_qubits", [3, 4, 5, 6])
+def test_qubo_energies(n_qubits):
+    Q = np.array(getattr(instances, f"qubits_{n_qubits}"))
+    energies = qubo_energies(Q)
+    expected = [np.dot(s, np.dot(Q, s)) for s in all_quantum_states(n_qubits)]
+    assert np.allclose(energies, expected)
+
+
+@pytest.mark.parametrize("n_qubits", [3, 4, 5, 6])
+def test_get_ground_state(n_qubits):
+    Q = np.array(getattr(instances, f"qubits_{n_qubits}"))
+    expected = getattr(instances, f"ground_{n_qubits}")
+    ground = tonic.get_ground_state(Q)
+    assert ground["bin_state"] == expected["bin_state"]
+    assert ground["dec_state"] == expected["dec_state"]
+    assert np.isclose(ground["energy"], expected["energy"])
+
+
+@pytest.mark.parametrize("n_qubits, batch_size", [(3, 3), (5, 8), (6, 2**16)])
+def test_qubo_ground_state(n_qubits, batch_size):
+    Q = np.array(getattr(instances, f"qubits_{n_qubits}"))
+    expected = getattr(instances, f"ground_{n_qubits}")
+    dec_state, energy = qubo_ground_state(Q, batch_size=batch_size)
+    assert dec_state == expected["dec_state"]
+    assert np.isclose(energy, expected["energy"])
+
+
+@pytest.mark.parametrize("n_qubits", [3, 4, 5, 6])
+def test_qubo_ground_state_numba(n_qubits):
+    pytest.importorskip("numba")
+    Q = np.array(getattr(instances, f"qubits_{n_qubits}"))
+    expected = getattr(instances, f"ground_{n_qubits}")
+    dec_state, energy = qubo_ground_state_numba(Q)
+    assert dec_state == expected["dec_state"]
+    assert np.isclose(energy, expected["energy"])
+
+
+def test_qubo_ground_state_numba_asymmetric():
+    pytest.importorskip("numba")
+    Q = np.random.default_rng(7).uniform(-1, 1, size=(9, 9))
+    energies = qubo_energies(Q)
+    dec_state, energy = qubo_ground_state_numba(Q)
+    assert dec_state == np.argmin(energies)
+    assert np.isclose(energy, np.min(energies))
+
+
+@pytest.mark.parametrize("n_qubits", [3, 6])
+def test_qubo_ground_state_gpu(n_qubits):
+    pytest.importorskip("cupy")
+    Q = np.array(getattr(instances, f"qubits_{n_qubits}"))
+    expected = getattr(instances, f"ground_{n_qubits}")
+    dec_state, energy = qubo_ground_state_gpu(Q, batch_size=16)
+    assert dec_state == expected["dec_state"]
+    assert np.isclose(energy, expected["energy"])
+
+
+@pytest.mark.parametrize("n_qubits, n_layers", [(3, 1), (4, 2)])
+def test_score(n_qubits, n_layers):
+    # accuracy 0 always scores 0, and the score grows with the accuracy
+    assert tonic.score([0.0, 0.0], n_qubits, n_layers) == 0.0
+    perfect = tonic.score([1.0, 1.0], n_qubits, n_layers)
+    middle = tonic.score([0.5, 0.5], n_qubits, n_layers)
+    assert 0.0 <= middle <= perfect <= 2.0
+    assert tonic.score([], n_qubits, n_layers) == 0.0
+    # out-of-range accuracy is clamped to the ends of the curve
+    assert tonic.score([1.5, 1.5], n_qubits, n_layers) == perfect
+
+
+@pytest.mark.parametrize("n_layers", [1, 4])
+def test_tqa_initial_point(n_layers):
+    x0 = tonic.tqa_initial_point(n_layers)
+    betas, gammas = x0[:n_layers], x0[n_layers:]
+    assert np.shape(x0) == (2 * n_layers,)
+    assert np.all(np.diff(betas) < 0) and np.all(np.diff(gammas) > 0)
+    assert np.isclose(gammas[-1], 0.75)
+
+
+def test_get_reference_cache(tmp_path, monkeypatch):
+    toniq = Toniq()
+    toniq.cache_dir = str(tmp_path)
+    Q = np.array(instances.qubits_3)
+    reference = toniq.get_reference(Q, n_layers=1, n_points=4, n_cores=1)
+    assert np.shape(reference) == (201,)
+    assert reference.dtype == np.float32
+    assert np.isclose(reference[-1], 1.0)
+
+    # a second call must not run QAOA again
+    def fail(*args, **kwargs):
+        raise AssertionError("the reference should have been loaded from the cache")
+
+    monkeypatch.setattr(toniq, "get_results_simulator", fail)
+    assert np.array_equal(
+        toniq.get_reference(Q, n_layers=1, n_points=4, n_cores=1), reference
+    )
+    # numpy integers give the same cache file, and only the finished file is left behind
+    assert np.array_equal(
+        toniq.get_reference(Q, n_layers=np.int64(1), n_points=np.int64(4)), reference
+    )
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_get_reference_without_cache(tmp_path):
+    toniq = Toniq()
+    toniq.cache_dir = str(tmp_path / "cache")
+    Q = np.array(instances.qubits_3)
+    reference = toniq.get_reference(
+        Q, n_layers=np.int64(1), n_points=2, n_cores=1, use_cache=False
+    )
+    assert np.shape(reference) == (201,)
+    assert not os.path.exists(toniq.cache_dir)
+
+
+def test_accuracy_histogram():
+    n_boxes = 200
+    bins = np.linspace(0, 1, n_boxes + 1)
+    accuracy = np.concatenate(
+        [np.random.default_rng(3).uniform(0, 1, 1000), [0.0, 0.5, 1.0], bins]
+    )
+    expected, _ = np.histogram(accuracy, bins=bins)
+    assert np.array_equal(_accuracy_histogram(accuracy, n_boxes), expected)
+
+    # rounding just outside [0, 1] lands in the end boxes instead of being dropped
+    counts = _accuracy_histogram(np.array([1.0, 1.0 + 1e-12, -1e-12]), n_boxes)
+    assert counts[-1] == 2
+    assert counts[0] == 1
+    assert counts.sum() == 3
+
+
 def test_Q_to_paulis_simple_case():
     Q = np.array([[1, 2], [2, 3]])
     expected_paulis = ["ZI", "IZ", "ZZ"]
@@ -55,3 +196,35 @@ def test_Q_to_paulis_simple_case():
         [a == b for a, b in zip(result_pauli_op.paulis.to_labels(), expected_paulis)]
     )
     assert np.allclose(result_pauli_op.coeffs, expected_coeffs)
+
+
+def test_cached_Q_to_paulis():
+    Q = np.array(instances.qubits_4)
+    op, offset = cached_Q_to_paulis(Q)
+    expected_op, expected_offset = Q_to_paulis(Q)
+    assert op == expected_op
+    assert np.isclose(offset, expected_offset)
+    # the same matrix, given as a list, hits the cache
+    assert cached_Q_to_paulis(instances.qubits_4)[0] is op
+    assert cached_Q_to_paulis(Q + 1.0)[0] is not op
+
+
+def test_cached_operator_energies():
+    Q = np.random.default_rng(3).uniform(-1, 1, size=(4, 4))  # asymmetric
+    op, _ = Q_to_paulis(Q)
+    energies = cached_operator_energies(op)
+    assert np.allclose(energies, op.to_matrix().diagonal().real)
+    assert cached_operator_energies(op) is energies
+    with pytest.raises(ValueError):
+        cached_operator_energies(SparsePauliOp(["XZ"]))
+
+
+def test_get_accuracy_simulator():
+    # the ground state of qubits_3 is 3, a distribution without it has accuracy 0
+    results = [
+        SimpleNamespace(eigenstate=QuasiDistribution({3: 0.75, 0: 0.25})),
+        SimpleNamespace(eigenstate=QuasiDistribution({1: 0.5, 6: 0.5})),
+    ]
+    accuracy = tonic.get_accuracy_simulator(results, 3)
+    assert isinstance(accuracy, np.ndarray)
+    assert np.allclose(accuracy, [0.75, 0.0])
@@ -9,9 +9,153 @@ sys.path.insert(0, modulepath)
 
 import pytest
 import numpy as np
+from types import SimpleNamespace
+from qiskit.circuit.library import QAOAAnsatz
+from qiskit.primitives import BackendSampler, StatevectorEstimator
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+from qiskit_aer.primitives import Sampler as AerSampler
+from qiskit_algorithms.minimum_eigensolvers import QAOA
+from qiskit_algorithms.optimizers import COBYLA
+from qiskit_algorithms.utils import algorithm_globals
+from qiskit_ibm_runtime.fake_provider import FakeManilaV2
 
-from else.benchmarking import Toniq
+from hamiltoniq.benchmark import (
+    Toniq,
+    _FixedAnsatzQAOA,
+    _PrecomputedEnergyQAOA,
+    _shot_ramp_optimizer,
+)
+from hamiltoniq.utility import cached_Q_to_paulis, cached_operator_energies
+from hamiltoniq import instances
 
 tonic = Toniq()
 
-def test_QAOA_cost()
\ No newline at end of file
+
+def test_QAOA_cost():
+    op, _ = cached_Q_to_paulis(instances.qubits_3)
+    ansatz = QAOAAnsatz(op, reps=2)
+    params = [0.1, 0.2, 0.3, 0.4]
+    cost = tonic.QAOA_cost(params, ansatz, op, StatevectorEstimator())
+    expected = Statevector(ansatz.assign_parameters(params)).expectation_value(op)
+    assert np.isclose(cost, np.real(expected))
+
+
+def test_get_results_processor_fake_backend():
+    toniq = Toniq()
+    toniq.op, _ = cached_Q_to_paulis(instances.qubits_3)
+    results = toniq.get_results_processor(
+        FakeManilaV2(), 1, n_reps=1, initial_point=toniq.tqa_initial_point(1)
+    )
+    assert len(results) == 1
+    assert np.shape(results[0].x) == (2,)
+
+
+def test_processor_run_fake_backend():
+    toniq = Toniq()
+    score = toniq.processor_run(FakeManilaV2(), 3, 1, n_reps=3)
+    assert np.isfinite(score) and score >= 0.0
+
+    accuracy_list = toniq.get_accuracy_processor(
+        [SimpleNamespace(x=np.zeros(2))] * 2, 3, 1
+    )
+    assert isinstance(accuracy_list, np.ndarray)
+    assert np.allclose(accuracy_list, 1 / 8)  # zero angles leave the uniform state
+
+
+def test_fixed_ansatz_transpiles_once():
+    op, _ = cached_Q_to_paulis(instances.qubits_3)
+    sampler = BackendSampler(backend=AerSimulator())
+    qaoa = _FixedAnsatzQAOA(sampler=sampler, optimizer=COBYLA(maxiter=5), reps=1)
+    for _ in range(3):
+        qaoa.compute_minimum_eigenvalue(op)
+    assert len(sampler.transpiled_circuits) == 1
+
+
+def test_repetitions_are_independent():
+    toniq = Toniq()
+    toniq.Q = np.array(instances.qubits_3)
+    toniq.op, _ = cached_Q_to_paulis(toniq.Q)
+    algorithm_globals.random.random()  # draw once in the parent process
+    # a single-core run followed by a multi-core run must neither hang nor repeat points
+    results = toniq.get_results_simulator(None, 1, n_reps=2, n_cores=1)
+    results += toniq.get_results_simulator(None, 1, n_reps=6, n_cores=3)
+    optimal_points = {tuple(np.round(res.optimal_point, 8)) for res in results}
+    assert len(optimal_points) == len(results)
+
+
+class _RecordingSampler:
+    def __init__(self):
+        self.shots = []
+
+    def set_options(self, shots):
+        self.shots.append(shots)
+
+
+class _FixedEvalsOptimizer:
+    def __init__(self, n_evals):
+        self.n_evals = n_evals
+
+    def minimize(self, fun, x0, jac=None, bounds=None):
+        for _ in range(self.n_evals):
+            fun(x0)
+        return "result"
+
+
+def test_shot_ramp_optimizer():
+    sampler = _RecordingSampler()
+    minimize = _shot_ramp_optimizer(_FixedEvalsOptimizer(45), sampler, max_shots=3000)
+    assert minimize(lambda x: 0.0, np.zeros(2)) == "result"
+    # 10 evaluations per step: 1024, 2048, then capped at max_shots
+    expected = [1024] * 10 + [2048] * 10 + [3000] * 25
+    assert sampler.shots[:-1] == expected
+    assert sampler.shots[-1] == 3000  # the final state is sampled with max_shots
+
+    # a second run starts the ramp again
+    sampler.shots.clear()
+    minimize(lambda x: 0.0, np.zeros(2))
+    assert sampler.shots[0] == 1024
+
+
+def test_shot_ramp_requires_backend():
+    toniq = Toniq()
+    toniq.Q = np.array(instances.qubits_3)
+    toniq.op, _ = cached_Q_to_paulis(toniq.Q)
+    with pytest.raises(ValueError):
+        toniq.get_results_simulator(None, 1, n_reps=1, n_cores=1, max_shots=100)
+
+
+@pytest.mark.parametrize(
+    "Q",
+    [np.array(getattr(instances, f"qubits_{n}")) for n in [3, 4, 5, 6]]
+    + [np.random.default_rng(7).uniform(-1, 1, size=(4, 4))],  # asymmetric
+)
+def test_precomputed_energy_cost(Q):
+    n_qubits = np.shape(Q)[0]
+    op, _ = cached_Q_to_paulis(Q)
+    sampler = AerSampler(run_options={"shots": None})  # exact probabilities
+    qaoa = _PrecomputedEnergyQAOA(
+        cached_operator_energies(op), sampler=sampler, optimizer=COBYLA(), reps=2
+    )
+    qaoa._check_operator_ansatz(op)
+    ansatz = qaoa.ansatz
+    ansatz.measure_all()
+    precomputed = qaoa._get_evaluate_energy(op, ansatz)
+    # the stock evaluation through the Pauli terms, on the same sampler
+    stock = QAOA._get_evaluate_energy(qaoa, op, ansatz)
+    params = np.random.default_rng(n_qubits).uniform(-1, 1, size=(2, 4))
+    assert np.allclose(precomputed(params), stock(params))
+    assert np.isclose(precomputed(params[0]), stock(params[0]))
+
+
+def test_precomputed_energy_rejects_callback():
+    Q = np.array(instances.qubits_3)
+    op, _ = cached_Q_to_paulis(Q)
+    qaoa = _PrecomputedEnergyQAOA(
+        cached_operator_energies(op),
+        sampler=BackendSampler(backend=AerSimulator()),
+        optimizer=COBYLA(),
+        callback=lambda *args: None,
+    )
+    with pytest.raises(ValueError):
+        qaoa.compute_minimum_eigenvalue(op)